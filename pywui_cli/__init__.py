@@ -1,108 +1,182 @@
+import functools
 import os.path
-import platform
 import shutil
 import subprocess
 import sys
 import typing
-from subprocess import DEVNULL, check_call, run as run_cmd
+from subprocess import DEVNULL, Popen, check_call, run as run_cmd
 
 import rich_click as click
-import ujson
-from yaspin import yaspin
 
-from .builder import PyWuiBuilder
-from .engine import put_file
+from .fsutil import fast_copy
 from .style import CliStyle
 
 echo = CliStyle()
 
 
+@functools.lru_cache(maxsize=1)
+def _json_module():
+    """Import orjson on first use, falling back to ujson when it is not installed."""
+    try:
+        import orjson
+        return orjson
+    except ImportError:
+        import ujson
+        return ujson
+
+
+def _json_loads(data: bytes) -> typing.Any:
+    return _json_module().loads(data)
+
+
+def _json_dumps(obj: typing.Any) -> bytes:
+    data = _json_module().dumps(obj)
+    # orjson returns bytes, ujson returns str
+    return data if isinstance(data, bytes) else data.encode()
+
+
+_NODE_VERSION_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "pywui", "node-version.json")
+
+
+def _node_major_version(node_path: str) -> int:
+    """Return the major version of the node binary, cached on its path, mtime and size."""
+    st = os.stat(node_path)
+    key = [node_path, st.st_mtime_ns, st.st_size]
+    try:
+        with open(_NODE_VERSION_CACHE, "rb") as f:
+            cached = _json_loads(f.read())
+        if cached["key"] == key:
+            return int(cached["major"])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    # Run the 'node --version' command and get the output
+    result = run_cmd(
+        [node_path, '--version'],
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    # Extract the version number from the output, which will look like 'v20.3.1'
+    version = result.stdout.strip().lstrip('v')
+    # Split the version string to get the major version
+    major_version = int(version.split('.')[0])
+    try:
+        os.makedirs(os.path.dirname(_NODE_VERSION_CACHE), exist_ok=True)
+        with open(_NODE_VERSION_CACHE, "wb") as f:
+            f.write(_json_dumps({"key": key, "major": major_version}))
+    except OSError:
+        pass
+    return major_version
+
+
 def check_node_installed():
     """Check if Node.js is installed."""
+    echo.info("Checking Node.JS ....")
+    node_path = shutil.which("node")
     try:
-        # Run the 'node --version' command and get the output
-        echo.info("Checking Node.JS ....")
-        result = run_cmd(
-            'node --version',
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            shell=True
-        )
-        # Extract the version number from the output, which will look like 'v20.3.1'
-        version = result.stdout.strip().lstrip('v')
-        # Split the version string to get the major version
-        major_version = int(version.split('.')[0])
-        if major_version >= 18:
-            return True
-        else:
-            echo.error("Error: Node.js version must be >= 18")
-            return False
-    except subprocess.CalledProcessError:
+        if node_path is None:
+            raise FileNotFoundError("node")
+        major_version = _node_major_version(node_path)
+    except (OSError, subprocess.CalledProcessError):
         echo.error("Node.js is not installed. Please install Node.js first.")
         return False
+    if major_version >= 18:
+        return True
+    else:
+        echo.error("Error: Node.js version must be >= 18")
+        return False
 
 
 def install_and_create_vite_app(project_dir, vite_args):
     """Install Vite using npm."""
-    cmd = ['npm', 'create', 'vite@latest', 'app', '-y', '--'] + vite_args
+    from yaspin import yaspin
+    npm = shutil.which("npm") or "npm"
+    cmd = [npm, 'create', 'vite@latest', 'app', '-y', '--'] + vite_args
     try:
-        run_cmd(" ".join(cmd), check=True, shell=True)
-        os.chdir(os.path.join(project_dir, "app"))
+        run_cmd(cmd, check=True, cwd=project_dir)
+        app_dir = os.path.join(project_dir, "app")
         with yaspin(text="Installing dependencies ...", color="blue") as spinner:
             spinner.color = 'blue'
-            check_call([sys.executable, "-m", "pip", 'install', "pywebview", "pywui"], stdout=DEVNULL)
-            check_call("npm install", stdout=DEVNULL, shell=True)
-            check_call("npm install @pywui/app", stdout=DEVNULL, shell=True)
+            # pip and npm touch disjoint trees, so let pip run while npm resolves
+            pip_process = Popen([sys.executable, "-m", "pip", 'install', "pywebview", "pywui"], stdout=DEVNULL)
+            try:
+                # Installing the extra package also installs everything in package.json,
+                # so a single npm run resolves the whole dependency graph once
+                check_call(
+                    [npm, "install", "@pywui/app", "--prefer-offline", "--no-audit", "--no-fund", "--loglevel=error"],
+                    stdout=DEVNULL,
+                    cwd=app_dir
+                )
+            finally:
+                # Always reap pip, but let an npm failure that is already propagating win
+                pip_process.wait()
+            if pip_process.returncode:
+                raise subprocess.CalledProcessError(pip_process.returncode, pip_process.args)
             spinner.color = 'green'
             spinner.ok("✔")
-    except subprocess.CalledProcessError as e:
+    except (subprocess.CalledProcessError, OSError) as e:
+        # OSError: npm is not on PATH, now that it is exec'd without a shell
         echo.error(f"Error when creating frontend app : {e}")
         sys.exit(1)
 
 
 def create_new_project(name, nv, vite_args):
+    from concurrent.futures import ThreadPoolExecutor
+    from .engine import put_file
     # Project dir
     project_dir = os.path.join(os.getcwd(), name)
-    if not os.path.exists(project_dir):
-        os.makedirs(project_dir, exist_ok=True)
-    else:
-        if not os.listdir(project_dir):
-            echo.error("Project dir is not empty")
-            return
-            # main py
-    put_file(os.path.join(project_dir, "main.py"), "main.py", {})
-    put_file(os.path.join(project_dir, "pywui.conf.json"), "pywui.conf.json", {"name": name})
-    shutil.copytree(
-        os.path.join(os.path.dirname(__file__), "stubs", "icons"),
-        os.path.join(project_dir, "icons"),
-        dirs_exist_ok=False
-    )
-
-    if not nv:
-        path = os.getcwd()
-        os.chdir(project_dir)
-        install_and_create_vite_app(project_dir, vite_args=vite_args)
-        os.chdir(path)
+    try:
+        os.makedirs(project_dir)
+    except FileExistsError:
+        # One directory entry is enough to know the project dir is not empty
+        with os.scandir(project_dir) as entries:
+            if next(entries, None) is not None:
+                echo.error("Project dir is not empty")
+                return
+    # Scaffold files are written in the background while npm does its (much longer) work
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        scaffold = [
+            executor.submit(put_file, os.path.join(project_dir, "main.py"), "main.py", {}),
+            executor.submit(
+                put_file,
+                os.path.join(project_dir, "pywui.conf.json"),
+                "pywui.conf.json",
+                {"name": name}
+            ),
+            executor.submit(
+                shutil.copytree,
+                os.path.join(os.path.dirname(__file__), "stubs", "icons"),
+                os.path.join(project_dir, "icons"),
+                dirs_exist_ok=False,
+                copy_function=fast_copy
+            ),
+        ]
+        if not nv:
+            install_and_create_vite_app(project_dir, vite_args=vite_args)
+        for future in scaffold:
+            future.result()
     echo.success("Project has been successfully created.")
 
 
-def _load_config() -> dict[str, typing.Any]:
-    config_path = os.path.join(os.getcwd(), 'pywui.conf.json')
-    if os.path.exists(config_path):
-        with open(config_path) as f:
-            try:
-                return ujson.load(f)
-            except ujson.JSONDecodeError:
-                return {}
-    return {}
+@functools.lru_cache(maxsize=1)
+def _read_config(config_path: str, mtime_ns: int) -> dict[str, typing.Any]:
+    # mtime_ns is only part of the cache key, so an edited config is re-parsed
+    with open(config_path, "rb") as f:
+        try:
+            return _json_loads(f.read())
+        except ValueError:
+            # Both orjson.JSONDecodeError and ujson.JSONDecodeError are ValueErrors
+            return {}
 
 
-def _get_icon(config):
-    current_os = str.lower(platform.system().lower())
-    icons: dict[str, typing.Any] = config.get("icons", {})
-    return icons.get(current_os, icons.get("linux"))
+def _load_config() -> dict[str, typing.Any]:
+    config_path = os.path.join(os.getcwd(), 'pywui.conf.json')
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
+    except OSError:
+        return {}
+    return _read_config(config_path, mtime_ns)
 
 
 @click.group()
@@ -114,10 +188,12 @@ def cli():
 @click.argument("name", required=True)
 @click.argument("vite_args", nargs=-1, type=click.UNPROCESSED)
 @click.option("-nv", "--no-vite", is_flag=True)
-def new(name, vite_args, no_vite):
+@click.option("--clear", is_flag=True, help="Clear the terminal before running.")
+def new(name, vite_args, no_vite, clear):
     """Command to create new pywui project."""
+    if clear:
+        click.clear()
     # Check if Node.js is installed
-    click.clear()
     if not check_node_installed():
         sys.exit(1)
     echo.success("Node.js is installed.")
@@ -128,9 +204,13 @@ def new(name, vite_args, no_vite):
 @cli.command()
 @click.argument("spec", default="main.py", required=False)
 @click.argument("args", nargs=-1, type=click.UNPROCESSED)
-def pack(spec, args):
+@click.option("--clear", is_flag=True, help="Clear the terminal before running.")
+def pack(spec, args, clear):
     """Command pack pywui project to single executable."""
-    click.clear()
+    from yaspin import yaspin
+    from .builder import PyWuiBuilder
+    if clear:
+        click.clear()
     with yaspin(text="Packing app ...", color="blue") as spinner:
         spinner.color = 'blue'
         bui = PyWuiBuilder(os.getcwd(), _load_config())
@@ -144,6 +224,7 @@ def pack(spec, args):
 @click.argument("entry", default="main.py", required=False)
 def run(entry):
     """Run python main.py"""
+    from .builder import PyWuiBuilder
     bui = PyWuiBuilder(os.getcwd(), _load_config())
     bui.run(entry)
 
@@ -1,81 +1,230 @@
+import asyncio
+import hashlib
 import os
-import platform
+import shutil
+import signal
 import subprocess
 import sys
-import time
 import typing
-from subprocess import Popen
+from asyncio.subprocess import Process
 from typing import Union
 
 from .style import CliStyle
 
 echo = CliStyle()
+# Key of the config "icons" table for the running OS
+_PLATFORM_KEY = {"linux": "linux", "darwin": "darwin", "win32": "windows"}.get(sys.platform, "linux")
+# Seconds vite output is buffered before it is echoed
+_FLUSH_INTERVAL = 0.05
+_READ_SIZE = 64 * 1024
+# Children get their own process group so shutdown reaches everything they spawn (npm -> sh -> vite)
+_NEW_GROUP = (
+    {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if sys.platform == "win32"
+    else {"start_new_session": True}
+)
+# Seconds a process group gets to exit after SIGTERM before it is killed
+_TERMINATE_TIMEOUT = 5
+# pyinstaller options that only apply to the build, which pyi-makespec rejects
+_BUILD_ONLY_FLAGS = {"-y", "--noconfirm", "--clean"}
+_BUILD_ONLY_OPTIONS = {"--distpath", "--workpath", "--upx-dir"}
+
+
+def _split_build_args(args: typing.Iterable[str]) -> tuple[list[str], list[str]]:
+    """Split pyinstaller arguments into the ones for pyi-makespec and the build-only ones."""
+    spec_args: list[str] = []
+    build_args: list[str] = []
+    it = iter(args)
+    for arg in it:
+        option = arg.split("=", 1)[0]
+        if arg in _BUILD_ONLY_FLAGS:
+            build_args.append(arg)
+        elif option in _BUILD_ONLY_OPTIONS:
+            build_args.append(arg)
+            value = next(it, None) if option == arg else None
+            if value is not None:
+                # "--distpath out": the value is the next argument
+                build_args.append(value)
+        else:
+            spec_args.append(arg)
+    return spec_args, build_args
+
+
+async def _poll_exit(process: Process):
+    # Process.wait() also waits for the pipes to close, which a surviving grandchild can hold open;
+    # returncode is set as soon as the process itself is reaped
+    while process.returncode is None:
+        await asyncio.sleep(0.1)
+
+
+async def _wait_exit(process: Process):
+    """Wait for ``process`` to exit, using pidfd readiness on the event loop when available."""
+    if not hasattr(os, "pidfd_open"):
+        return await _poll_exit(process)
+    try:
+        pidfd = os.pidfd_open(process.pid)
+    except OSError:
+        # Kernel older than 5.3 or the process is already gone
+        return await _poll_exit(process)
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+    loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+    try:
+        await exited
+    finally:
+        loop.remove_reader(pidfd)
+        os.close(pidfd)
+
+
+async def _signal_group(process: Process, force: bool = False):
+    """Stop ``process`` together with every child in its process group."""
+    if sys.platform == "win32":
+        # terminate() would only reach the npm.cmd wrapper; /T takes down the whole tree
+        killer = await asyncio.create_subprocess_exec(
+            "taskkill", "/T", "/F", "/PID", str(process.pid),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        await killer.wait()
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def _group_alive(process: Process) -> bool:
+    """Whether any process is left in the group ``process`` leads."""
+    if sys.platform == "win32":
+        # taskkill /F has already ended the whole tree
+        return False
+    try:
+        os.killpg(process.pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+async def _wait_group(process: Process):
+    """Wait for ``process`` and then for the rest of its process group to exit."""
+    await _wait_exit(process)
+    while _group_alive(process):
+        await asyncio.sleep(0.1)
 
 
 class PyWuiBuilder:
-    vite_process: Union[Popen, None] = None
-    webview_process: Union[Popen, None] = None
+    vite_process: Union[Process, None] = None
+    webview_process: Union[Process, None] = None
 
     def __init__(self, cwd: str, config: dict[str, any]):
         self.cwd = cwd
         self.config = config
         self.windows = sys.platform.lower().startswith('win')
 
-    def _stream_output(self, entry: str):
+    async def _read_vite(self, entry: str, app_started: asyncio.Future):
+        """Forward vite output and start the python app once the dev server is up."""
+        loop = asyncio.get_running_loop()
+        # Lines are echoed in batches so a burst of vite output costs one terminal write
+        pending: list[str] = []
+        flush_at = 0.0
+        partial = b""
+        try:
+            while True:
+                timeout = max(0.0, flush_at - loop.time()) if pending else None
+                try:
+                    # Take whatever the pipe holds in one read instead of one await per line
+                    chunk = await asyncio.wait_for(self.vite_process.stdout.read(_READ_SIZE), timeout)
+                except asyncio.TimeoutError:
+                    echo.info("\n".join(pending))
+                    pending.clear()
+                    continue
+                if chunk:
+                    *lines, partial = (partial + chunk).split(b"\n")
+                else:
+                    lines, partial = [partial] if partial else [], b""
+                for vite_output in lines:
+                    vite_output = vite_output.decode("utf-8", errors="replace")
+                    if ("Local" in vite_output or "Network" in vite_output) and self.webview_process is None:
+                        await asyncio.sleep(1)
+                        self.webview_process = await asyncio.create_subprocess_exec(
+                            sys.executable, entry, **_NEW_GROUP
+                        )
+                        app_started.set_result(self.webview_process)
+                    if not pending:
+                        flush_at = loop.time() + _FLUSH_INTERVAL
+                    pending.append(f"[Vite] {vite_output.strip()}")
+                if not chunk:
+                    break
+        finally:
+            if pending:
+                echo.info("\n".join(pending))
+
+    @staticmethod
+    async def _wait_app(app_started: asyncio.Future):
+        process = await app_started
+        await _wait_exit(process)
+
+    async def _stream_output(self, entry: str):
         """Handle output from both vite and python processes."""
-        while True:
-            if self.webview_process and self.webview_process.poll() is not None:
+        vite_folder = os.path.join(self.cwd, "app")
+        try:
+            self.vite_process = await asyncio.create_subprocess_exec(
+                shutil.which("npm") or "npm", "run", "dev",
+                cwd=vite_folder,
+                stdout=subprocess.PIPE,
+                # Merge stderr so the single reader drains both and a full stderr pipe can't stall vite
+                stderr=subprocess.STDOUT,
+                **_NEW_GROUP,
+            )
+        except OSError as e:
+            echo.error(f"Error when starting vite dev server : {e}")
+            return
+        app_started = asyncio.get_running_loop().create_future()
+        app_exit = asyncio.create_task(self._wait_app(app_started))
+        tasks = {
+            asyncio.create_task(self._read_vite(entry, app_started)),
+            asyncio.create_task(_wait_exit(self.vite_process)),
+            app_exit,
+        }
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            if app_exit in done:
                 echo.info("App process has finished.")
-                break
-            vite_output = self.vite_process.stdout.readline()
-            if vite_output:
-                if ("Local" in vite_output or "Network" in vite_output) and self.webview_process is None:
-                    time.sleep(1)
-                    self.webview_process = Popen(
-                        [sys.executable, entry] if self.windows else [f"{sys.executable} {entry}"],
-                        universal_newlines=True,
-                        shell=True
-                    )
-                echo.info(f"[Vite] {vite_output.strip()}")
-
-            if self.vite_process.poll() is not None:
+            else:
                 echo.info("Vite process has finished.")
-                break
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Ensure both process groups are terminated on exit; a leader that already
+            # exited may still have left children behind, so every group is signalled
+            echo.success("Terminating ..")
+            processes = [p for p in (self.vite_process, self.webview_process) if p]
+            for process in processes:
+                await _signal_group(process)
+            waits = {asyncio.create_task(_wait_group(p)): p for p in processes}
+            _, stuck = await asyncio.wait(waits, timeout=_TERMINATE_TIMEOUT)
+            if stuck:
+                for task in stuck:
+                    await _signal_group(waits[task], force=True)
+                await asyncio.wait(stuck, timeout=1)
+            # With the groups gone the pipes reach EOF, so let the transports close before the loop does
+            await asyncio.wait([asyncio.create_task(p.wait()) for p in processes], timeout=1)
+            echo.success("Terminated")
 
     def run(self, entry: str):
-        vite_folder = os.path.join(self.cwd, "app")
-        self.vite_process = Popen(
-            ["npm", "run", "dev"] if self.windows else ["npm run dev"],
-            cwd=vite_folder,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            shell=True,
-            universal_newlines=True,
-            encoding="utf-8"
-        )
-        # Start the python script
         try:
-            # Monitor the python script
-            self._stream_output(entry)
+            asyncio.run(self._stream_output(entry))
         except KeyboardInterrupt:
             echo.error("Interrupted by user. Exiting.")
-        finally:
-            # Ensure both processes are terminated on exit
-            echo.success("Terminating ..")
-            if self.vite_process:
-                self.vite_process.terminate()
-            if self.webview_process:
-                self.webview_process.terminate()
-            echo.success("Terminated")
 
     def _get_icon(self):
-        current_os = str.lower(platform.system().lower())
         icons: dict[str, typing.Any] = self.config.get("icons", {})
-        return icons.get(current_os, icons.get("linux"))
+        return icons.get(_PLATFORM_KEY) or icons.get("linux")
 
     def create_installer(self):
         name: str = self.config.get("name", "pywuiapp")
-        from .installer import install_dependencies, create_deb, create_dmg, create_msi, create_rpm
+        from .installer import IS_DEBIAN, IS_REDHAT, install_dependencies, create_deb, create_dmg, create_msi, create_rpm
         system = install_dependencies()
         if system == "Windows":
             pass
@@ -90,10 +239,10 @@ class PyWuiBuilder:
                 custom_layout=True
             )
         elif system == "Linux":
-            if os.path.exists("/etc/debian_version"):
+            if IS_DEBIAN:
                 print(f"Creating DEB for {name} on Debian-based Linux...")
                 create_deb(self.cwd, name, icon_path=self._get_icon())
-            elif os.path.exists("/etc/redhat-release"):
+            elif IS_REDHAT:
                 print(f"Creating RPM for {name} on Red Hat-based Linux...")
                 create_rpm(self.cwd, name)
             else:
@@ -103,27 +252,44 @@ class PyWuiBuilder:
 
     def pack(self, spec: str, args: tuple):
         try:
-            import pyinstaller
+            import PyInstaller
         except ImportError:
-            subprocess.run(
-                ["pip", 'install', "pyinstaller"],
-                stdout=subprocess.DEVNULL,
-                shell=True)
+            from .installer import pip_install
+            pip_install("pyinstaller", quiet=True)
 
-        build_command = ["npm", "run", "build"] if self.windows else ["npm run build"]
-        subprocess.check_call(build_command, stdout=subprocess.DEVNULL, shell=True, cwd=os.path.join(self.cwd, "app"))
+        build_command = [shutil.which("npm") or "npm", "run", "build"]
+        try:
+            subprocess.check_call(build_command, stdout=subprocess.DEVNULL, cwd=os.path.join(self.cwd, "app"))
+        except (subprocess.CalledProcessError, OSError) as e:
+            echo.error(f"Error when building frontend app : {e}")
+            sys.exit(1)
         icon = self._get_icon()
         name = self.config.get("name", "pywui")
         dist = self.config.get("static", {}).get("dist", "app/dist")
-        freeze_command = [
-                             'pyinstaller',
-                             '-n', f'{name}',
-                             '--onefile',
-                             '--noconfirm',
-                             '--add-data', f'{dist}:.',
-                             '--add-data', 'pywui.conf.json:.',
-                             '--add-data', 'icons:icons',
-                             f'--icon={icon}',
-                             '--windowed',
-                         ] + list(args) + [spec]
-        subprocess.check_call(freeze_command, stdout=subprocess.DEVNULL)
+        spec_args, build_args = _split_build_args(args)
+        makespec_command = [
+                               'pyi-makespec',
+                               '-n', f'{name}',
+                               '--onefile',
+                               '--add-data', f'{dist}:.',
+                               '--add-data', 'pywui.conf.json:.',
+                               '--add-data', 'icons:icons',
+                               f'--icon={icon}',
+                               '--windowed',
+                           ] + spec_args + [spec]
+        spec_file = os.path.join(self.cwd, f"{name}.spec")
+        # The spec is regenerated only when the flags it was made from change;
+        # build-only options don't end up in the spec, so they are not part of the digest
+        stamp_file = f"{spec_file}.sha256"
+        digest = hashlib.sha256("\0".join(makespec_command).encode()).hexdigest()
+        try:
+            with open(stamp_file) as f:
+                fresh = f.read() == digest and os.path.isfile(spec_file)
+        except OSError:
+            fresh = False
+        if not fresh:
+            subprocess.check_call(makespec_command, stdout=subprocess.DEVNULL, cwd=self.cwd)
+            with open(stamp_file, "w") as f:
+                f.write(digest)
+        freeze_command = ['pyinstaller', '--noconfirm', *build_args, spec_file]
+        subprocess.check_call(freeze_command, stdout=subprocess.DEVNULL, cwd=self.cwd)
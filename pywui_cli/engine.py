@@ -1,6 +1,10 @@
+import functools
 import os
 
-from minijinja import Environment
+
+_STUBS_DIR = os.path.join(os.path.dirname(__file__), 'stubs')
+# Templates rendered by put_file, compiled once when the environment is built instead of on first render
+_PRELOADED = ("main.py", "pywui.conf.json")
 
 
 def _loader(name: str):
@@ -10,7 +14,7 @@ def _loader(name: str):
             return None
         segments.append(segment)
     try:
-        path = os.path.join(os.path.dirname(__file__), 'stubs', *segments)
+        path = os.path.join(_STUBS_DIR, *segments)
         with open(path) as f:
             content = f.read()
             return content
@@ -18,12 +22,21 @@ def _loader(name: str):
         pass
 
 
-env = Environment(loader=_loader)
-env.add_filter('capitalize', str.capitalize)
-env.add_filter('lower', str.lower)
+@functools.lru_cache(maxsize=None)
+def get_env():
+    """Build the shared minijinja environment on first use, so commands that never render skip the import."""
+    from minijinja import Environment
+    env = Environment(loader=_loader)
+    env.add_filter('capitalize', str.capitalize)
+    env.add_filter('lower', str.lower)
+    for name in _PRELOADED:
+        source = _loader(name)
+        if source is not None:
+            env.add_template(name, source)
+    return env
 
 
 def put_file(dst: str, template: str, context: dict = None) -> None:
     with open(dst, 'w') as f:
-        content = env.render_template(template, **context)
+        content = get_env().render_template(template, **(context or {}))
         f.write(content)
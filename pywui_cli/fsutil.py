@@ -0,0 +1,84 @@
+import errno
+import os
+import shutil
+import stat
+import sys
+
+# errnos meaning "this in-kernel copy isn't available here", not a real IO failure
+_UNSUPPORTED = (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSOCK)
+_BUFFER_SIZE = 1 << 20
+# Only Linux can sendfile into a regular file; elsewhere sendfile needs a socket output
+_USE_KERNEL_COPY = sys.platform.startswith("linux")
+
+
+def _kernel_copy(infd: int, outfd: int, size: int) -> int:
+    """Copy in-kernel with copy_file_range, then sendfile; return how many bytes were copied."""
+    offset = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while offset < size:
+                copied = os.copy_file_range(infd, outfd, size - offset, offset, offset)
+                if not copied:
+                    return offset
+                offset += copied
+            return offset
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            # sendfile writes at the current position of outfd, which copy_file_range left at 0
+            os.lseek(outfd, offset, os.SEEK_SET)
+            while offset < size:
+                sent = os.sendfile(outfd, infd, offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+    return offset
+
+
+def fast_copy(src, dst, src_stat: os.stat_result = None):
+    """
+    Copy a file in-kernel with copy_file_range or sendfile, keeping its permission bits.
+
+    On Btrfs and XFS the kernel turns copy_file_range into a reflink, so large
+    binaries are cloned instead of streamed through user space. Whatever the kernel
+    could not copy is finished with a 1 MiB buffered loop. Callers that already
+    stat-ed ``src`` can pass the result as ``src_stat`` to skip another fstat.
+    Other platforms go through shutil.copyfile, which clones with fcopyfile on macOS.
+    """
+    if not _USE_KERNEL_COPY:
+        shutil.copyfile(src, dst)
+        os.chmod(dst, stat.S_IMODE((src_stat or os.stat(src)).st_mode))
+        return dst
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        st = src_stat or os.fstat(fsrc.fileno())
+        copied = _kernel_copy(fsrc.fileno(), fdst.fileno(), st.st_size)
+        if copied < st.st_size:
+            fsrc.seek(copied)
+            fdst.seek(copied)
+            shutil.copyfileobj(fsrc, fdst, _BUFFER_SIZE)
+    os.chmod(dst, stat.S_IMODE(st.st_mode))
+    return dst
+
+
+def move_file(src, dst):
+    """Rename ``src`` to ``dst``, only copying when they sit on different filesystems."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+
+def write_text(path, text: str):
+    """Write a small UTF-8 text file with one open and one write, bypassing TextIOWrapper."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, text.encode("utf-8"))
+    finally:
+        os.close(fd)
@@ -1,88 +1,95 @@
+import functools
+import hashlib
+import importlib
+import io
 import os
 import platform
+import shutil
+import stat
 import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
 
-try:
-    import msilib
-except ImportError:
-    msilib = None
+from .fsutil import fast_copy, move_file, write_text
 
-try:
-    import dmgbuild
-except ImportError:
-    dmgbuild = None
 
-try:
-    from debian.debfile import DebFile
-except ImportError:
-    DebFile = None
+@functools.lru_cache(maxsize=None)
+def _optional_module(name: str):
+    """Import an optional packaging module on first use, or return None if it is missing."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def _reset_optional_modules():
+    """Forget failed optional imports after a packager has been installed."""
+    importlib.invalidate_caches()
+    _optional_module.cache_clear()
 
-try:
-    from rpm.spec import Spec
-    from rpm.package import Package
-except ImportError:
-    Spec, Package = None, None
+
+def _require_file(path, label: str) -> os.stat_result:
+    """Stat ``path`` once, raising FileNotFoundError unless it is a regular file."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        raise FileNotFoundError(f"{label} '{path}' not found.")
+    return st
+
+
+def pip_install(*packages: str, quiet: bool = False):
+    """Install packages with the running interpreter's pip, skipping byte-compilation."""
+    subprocess.check_call(
+        [sys.executable, "-m", "pip", "install", "--no-compile", "--disable-pip-version-check", *packages],
+        stdout=subprocess.DEVNULL if quiet else None
+    )
+
+
+# The OS never changes while the CLI runs, so probe it once; a distro file added
+# after import (e.g. inside a running container) is only seen on re-import
+_SYSTEM = platform.system()
+IS_DEBIAN = _SYSTEM == "Linux" and os.path.exists("/etc/debian_version")
+IS_REDHAT = _SYSTEM == "Linux" and os.path.exists("/etc/redhat-release")
 
 
 def install_dependencies():
     """Install necessary dependencies based on the operating system."""
-    system = platform.system()
+    system = _SYSTEM
 
     if system == "Windows":
         print("Checking msilib for MSI creation...")
-        if msilib is None:
+        if _optional_module("msilib") is None:
             print("msilib is included with Python, please ensure it's working correctly.")
     elif system == "Darwin":
         print("Checking dmgbuild for DMG creation...")
-        if dmgbuild is None:
+        if _optional_module("dmgbuild") is None:
             print("Installing dmgbuild...")
-            subprocess.check_call(["pip", "install", "dmgbuild"])
+            pip_install("dmgbuild")
+            _reset_optional_modules()
     elif system == "Linux":
-        if os.path.exists("/etc/debian_version"):
+        if IS_DEBIAN:
             print("Checking python3-debian for DEB creation...")
-            if DebFile is None:
+            if _optional_module("debian.debfile") is None:
                 print("Installing python3-debian...")
                 subprocess.check_call(["sudo", "apt-get", "install", "-y", "python3-debian"])
-        elif os.path.exists("/etc/redhat-release"):
+                _reset_optional_modules()
+        elif IS_REDHAT:
             print("Checking rpm-py-installer for RPM creation...")
-            if Spec is None or Package is None:
+            if _optional_module("rpm.spec") is None or _optional_module("rpm.package") is None:
                 print("Installing rpm-py-installer...")
-                subprocess.check_call(["pip", "install", "rpm-py-installer"])
+                pip_install("rpm-py-installer")
+                _reset_optional_modules()
 
     return system
 
 
-def create_msi(
-        cwd,
-        app_name,
-        version="1.0.0",
-        description="No description",
-        maintainer="Your Name <youremail@example.com>",
-        icon_path=None,
-        output_dir="dist"
-):
-    """
-    Creates a Windows installer (.exe) for the specified application using Inno Setup.
-
-    :param cwd: The current directory of the application.
-    :param app_name: The name of the application.
-    :param version: The version of the app (default is "1.0.0").
-    :param description: A short description of the app (default is "No description").
-    :param maintainer: The maintainer's name and email (default is "Your Name <youremail@example.com>").
-    :param icon_path: Path to an icon file for the application (optional).
-    :param output_dir: Directory to save the installer (default is "dist").
-    """
-    # Define the paths
-    from pathlib import Path
-    installer_script_path = Path(cwd, f"{app_name}_installer.iss")
-    binary_path = Path(cwd, 'dist', f"{app_name}.exe")
-    setup_output_path = Path(output_dir)
-
-    if not os.path.isfile(binary_path):
-        raise FileNotFoundError(f"Binary file '{binary_path}' not found.")
-
-    # Create the Inno Setup script content
-    inno_script = f"""
+# Inno Setup script rendered by create_msi; {{...}} are Inno constants, not placeholders
+_INNO_TEMPLATE = """
 [Setup]
 AppName={app_name}
 AppVersion={version}
@@ -102,34 +109,74 @@ AppUpdatesURL=http://www.example.com
 Source: "{binary_path}"; DestDir: "{{app}}"; Flags: ignoreversion
 
 [Icons]
-Name: "{{autoprograms}}\\{app_name}"; Filename: "{{app}}\\{app_name}.exe"
+Name: "{{autoprograms}}\\{app_name}"; Filename: "{{app}}\\{app_name}.exe"{icon_line}
 
 [Run]
 Filename: "{{app}}\\{app_name}.exe"; Description: "{app_name}"; Flags: nowait postinstall skipifsilent
 """
 
-    if icon_path:
-        inno_script += f"""
-[Icons]
-Name: "{{autoprograms}}\\{app_name}"; Filename: "{{app}}\\{app_name}.exe"; IconFilename: "{icon_path}"
-"""
+
+def create_msi(
+        cwd,
+        app_name,
+        version="1.0.0",
+        description="No description",
+        maintainer="Your Name <youremail@example.com>",
+        icon_path=None,
+        output_dir="dist"
+):
+    """
+    Creates a Windows installer (.exe) for the specified application using Inno Setup.
+
+    :param cwd: The current directory of the application.
+    :param app_name: The name of the application.
+    :param version: The version of the app (default is "1.0.0").
+    :param description: A short description of the app (default is "No description").
+    :param maintainer: The maintainer's name and email (default is "Your Name <youremail@example.com>").
+    :param icon_path: Path to an icon file for the application (optional).
+    :param output_dir: Directory to save the installer (default is "dist").
+    """
+    # Define the paths
+    installer_script_path = os.path.join(cwd, f"{app_name}_installer.iss")
+    binary_path = os.path.join(cwd, 'dist', f"{app_name}.exe")
+    setup_output_path = os.path.normpath(output_dir)
+
+    _require_file(binary_path, "Binary file")
+
+    # Create the Inno Setup script content
+    icon_line = f'; IconFilename: "{icon_path}"' if icon_path else ""
+    inno_script = _INNO_TEMPLATE.format_map({
+        "app_name": app_name,
+        "version": version,
+        "maintainer": maintainer,
+        "setup_output_path": setup_output_path,
+        "binary_path": binary_path,
+        "icon_line": icon_line,
+    })
 
     # Save the Inno Setup script
-    with open(installer_script_path, 'w') as f:
-        f.write(inno_script)
+    write_text(installer_script_path, inno_script)
 
     # Run Inno Setup to generate the installer
     inno_setup_path = r"C:\Program Files (x86)\Inno Setup 6\ISCC.exe"  # Update the path if needed
-    subprocess.run([inno_setup_path, str(installer_script_path)], check=True)
+    subprocess.run([inno_setup_path, installer_script_path], check=True)
 
     print(f"Installer created successfully: {setup_output_path}/{app_name}_installer.exe")
 
 
+def _mac_version():
+    """Return the running macOS version as a tuple of ints, or () when unknown."""
+    release = platform.mac_ver()[0]
+    try:
+        return tuple(int(part) for part in release.split("."))
+    except ValueError:
+        return ()
+
+
 def create_dmg_(cwd: any, app_name: str, icon: str, badge: str):
     """Creates a DMG installer on macOS using dmgbuild."""
-    try:
-        import dmgbuild
-    except ImportError:
+    dmgbuild = _optional_module("dmgbuild")
+    if dmgbuild is None:
         raise ImportError("dmgbuild package is required to create DMG files on macOS.")
 
     binary_name = os.path.join(cwd, "dist", f"{app_name}.app")
@@ -155,7 +202,8 @@ def create_dmg(
         version="1.0.0",
         output_dir="dist",
         icon=None,
-        custom_layout=False
+        custom_layout=False,
+        compression="ULFO"
 ):
     """
     Create a .dmg disk image for macOS from an app bundle.
@@ -166,33 +214,43 @@ def create_dmg(
     :param output_dir: Directory to save the .dmg file (default is current directory).
     :param icon: Optional background image for the DMG (default is None).
     :param custom_layout: Whether to use a custom layout for the DMG (default is False).
+    :param compression: hdiutil image format for the basic layout (default is "ULFO").
+        "ULFO" (LZFSE, macOS 10.11+) decompresses fastest, "ULMO" (LZMA, macOS 10.15+)
+        gives the smallest image and "UDZO" (zlib) works everywhere.
     """
-    from pathlib import Path
-    import shutil
-    app_bundle_path = Path(cwd) / 'dist' / f'{app_name}.app'
-    dmg_output_path = Path(output_dir) / f"{app_name}-{version}.dmg"
+    app_bundle_path = os.path.join(cwd, 'dist', f'{app_name}.app')
+    dmg_output_path = os.path.join(output_dir, f"{app_name}-{version}.dmg")
     dmg_temp_folder = Path(cwd) / "dmg_temp"
 
     # Ensure the app bundle exists
-    if not app_bundle_path.is_dir():
+    if not os.path.isdir(app_bundle_path):
         raise FileNotFoundError(f"The app bundle {app_bundle_path} does not exist.")
 
-    # Create a temporary folder to structure the DMG contents
-    dmg_temp_folder.mkdir(parents=True, exist_ok=True)
-
-    # Copy the app bundle to the temp folder
-    app_dest = dmg_temp_folder / f"{app_name}.app"
-    if not app_dest.exists():
-        shutil.copytree(app_bundle_path, app_dest)
-
-    # Create a symbolic link to Applications
-    applications_link = dmg_temp_folder / "Applications"
-    if not applications_link.exists():
-        applications_link.symlink_to("/Applications")
-
     if custom_layout:
-        if icon is None or not Path(icon).is_file():
+        if icon is None or not os.path.isfile(icon):
             raise ValueError("For custom layout, a valid background image file must be provided.")
+
+        # Create a temporary folder to structure the DMG contents
+        dmg_temp_folder.mkdir(parents=True, exist_ok=True)
+
+        # Copy the app bundle to the temp folder
+        app_dest = dmg_temp_folder / f"{app_name}.app"
+        if not app_dest.exists():
+            # cp -c clones the bundle on APFS, so only metadata is written
+            cloned = subprocess.run(
+                ["cp", "-cR", app_bundle_path, str(app_dest)],
+                stderr=subprocess.DEVNULL
+            ).returncode == 0
+            if not cloned:
+                shutil.rmtree(app_dest, ignore_errors=True)
+                shutil.copytree(app_bundle_path, app_dest)
+
+        # Create a symbolic link to Applications
+        try:
+            (dmg_temp_folder / "Applications").symlink_to("/Applications")
+        except FileExistsError:
+            pass
+
         # Use create-dmg for a custom layout with background
         create_dmg_command = [
             "create-dmg",
@@ -202,30 +260,172 @@ def create_dmg(
             "--icon-size", "100",
             "--icon", f"{app_name}.app", "175", "120",
             "--app-drop-link", "425", "120",
-            str(dmg_output_path),
+            dmg_output_path,
             str(dmg_temp_folder)
         ]
-        os.system(" ".join(create_dmg_command))
+        try:
+            subprocess.run(create_dmg_command, check=True, stdout=subprocess.DEVNULL)
+        finally:
+            # Clean up the temporary folder
+            shutil.rmtree(dmg_temp_folder, ignore_errors=True)
     else:
-        # Create DMG using hdiutil for a basic layout
+        # Create DMG using hdiutil for a basic layout, straight from the app bundle
+        if compression == "ULMO" and _mac_version() < (10, 15):
+            compression = "ULFO"
+        if compression == "ULFO" and _mac_version() < (10, 11):
+            compression = "UDZO"
         dmg_command = [
             "hdiutil", "create",
-            str(dmg_output_path),
+            dmg_output_path,
             "-volname", app_name,
-            "-srcfolder", str(dmg_temp_folder),
-            "-ov", "-format", "UDZO"
+            "-srcfolder", app_bundle_path,
+            "-ov", "-format", compression
         ]
-        os.system(" ".join(dmg_command))
-
-    # Clean up the temporary folder
-    shutil.rmtree(dmg_temp_folder, ignore_errors=True)
+        subprocess.run(dmg_command, check=True, stdout=subprocess.DEVNULL)
 
     print(f"Disk image created successfully: {dmg_output_path}")
 
 
+# (rpmbuild dir, architecture) layouts already created by create_rpm in this process
+_RPM_DIRS_READY: set[tuple[Path, str]] = set()
+
+
+# Package metadata templates rendered by create_deb / create_rpm
+_DEB_CONTROL_TEMPLATE = """Package: {app_name}
+Version: {version}
+Section: base
+Priority: optional
+Architecture: {architecture}
+Depends: {dependencies}
+Maintainer: {maintainer}
+Description: {description}
+License: MIT
+"""
+
+_DESKTOP_TEMPLATE = """[Desktop Entry]
+Name={app_name}
+Comment={description}
+Exec=/usr/local/bin/{app_name}
+Icon=/usr/share/icons/hicolor/512x512/apps/{app_name}.png
+Terminal=false
+Type=Application
+Categories={categories};
+"""
+
+_RPM_SPEC_TEMPLATE = """
+Name:           {app_name}
+Version:        {version}
+Release:        {release}
+Summary:        {description}
+License:        GPL
+Group:          Applications/System
+Architecture:   {architecture}
+Requires:       {dependencies}
+
+%description
+{description}
+
+%files
+%attr(0755,root,root) /usr/local/bin/{app_name}
+%attr(0644,root,root) /usr/share/applications/{desktop_file_name}
+%attr(0644,root,root) /usr/share/icons/hicolor/512x512/apps/{app_name}.png
+
+%post
+update-desktop-database &> /dev/null || :
+
+%postun
+update-desktop-database &> /dev/null || :
+"""
+
+
 # Example usage
 
 
+def _root_owned(info: tarfile.TarInfo):
+    info.uid = info.gid = 0
+    info.uname = info.gname = "root"
+    return info
+
+
+def _control_entry(info: tarfile.TarInfo):
+    # Set the DEBIAN permissions on the archive entries instead of chmod-ing the staged files
+    info.mode = 0o755
+    return _root_owned(info)
+
+
+def _ar_member(out, name: str, fileobj, size: int):
+    """Append one member to an ar archive: a 60-byte header, the data and an even-size pad."""
+    header = f"{name:<16}{int(time.time()):<12}{0:<6}{0:<6}{0o100644:<8o}{size:<10}`\n"
+    out.write(header.encode("ascii"))
+    shutil.copyfileobj(fileobj, out)
+    if size % 2:
+        out.write(b"\n")
+
+
+# data.tar suffix, tarfile fallback mode and level keyword, external tools by preference
+# with their flags; xz -T0 and pigz compress on every core
+_DEB_COMPRESSION = {
+    "xz": (".xz", "w:xz", "preset", (("xz", ("-T0",)),)),
+    "gzip": (".gz", "w:gz", "compresslevel", (("pigz", ()), ("gzip", ()))),
+    "none": ("", "w", None, ()),
+}
+
+
+def _build_deb(root_dir: Path, output_file: str, compression: str = "xz", level: int = 6):
+    """
+    Build a .deb from a staged tree without dpkg-deb.
+
+    A .deb is an ar archive of debian-binary, control.tar.gz (the DEBIAN dir) and
+    data.tar[.xz|.gz] (everything else), in that order.
+    """
+    if compression not in _DEB_COMPRESSION:
+        raise ValueError(f"Unsupported deb compression '{compression}'.")
+    suffix, tar_mode, level_keyword, tools = _DEB_COMPRESSION[compression]
+
+    def data_filter(info: tarfile.TarInfo):
+        if info.name == "./DEBIAN" or info.name.startswith("./DEBIAN/"):
+            return None
+        return _root_owned(info)
+
+    with tempfile.TemporaryFile(dir=root_dir.parent) as control_tar, \
+            tempfile.TemporaryFile(dir=root_dir.parent) as data_tar:
+        with tarfile.open(fileobj=control_tar, mode="w:gz", format=tarfile.GNU_FORMAT) as tar:
+            tar.add(root_dir / "DEBIAN", arcname=".", filter=_control_entry)
+        tool_path, tool_flags = None, ()
+        for tool, flags in tools:
+            tool_path = shutil.which(tool)
+            if tool_path:
+                tool_flags = flags
+                break
+        if tool_path:
+            # The payload is the one CPU-bound step, so hand it to the external compressor
+            compressor = subprocess.Popen(
+                [tool_path, *tool_flags, f"-{level}", "-c"],
+                stdin=subprocess.PIPE,
+                stdout=data_tar
+            )
+            try:
+                with tarfile.open(fileobj=compressor.stdin, mode="w|", format=tarfile.GNU_FORMAT) as tar:
+                    tar.add(root_dir, arcname=".", filter=data_filter)
+            finally:
+                compressor.stdin.close()
+                if compressor.wait():
+                    raise subprocess.CalledProcessError(compressor.returncode, compressor.args)
+        else:
+            options = {level_keyword: level} if level_keyword else {}
+            with tarfile.open(fileobj=data_tar, mode=tar_mode, format=tarfile.GNU_FORMAT, **options) as tar:
+                tar.add(root_dir, arcname=".", filter=data_filter)
+
+        with open(output_file, "wb") as out:
+            out.write(b"!<arch>\n")
+            _ar_member(out, "debian-binary", io.BytesIO(b"2.0\n"), 4)
+            for name, member in (("control.tar.gz", control_tar), (f"data.tar{suffix}", data_tar)):
+                # The compressor writes through the fd, so the file position can't be trusted for the size
+                size = member.seek(0, os.SEEK_END)
+                member.seek(0)
+                _ar_member(out, name, member, size)
+
+
 def create_deb(
         cwd: str,
         app_name: str,
@@ -236,7 +436,11 @@ def create_deb(
         dependencies: str = "libc6 (>= 2.27)",
         output_dir: str = "dist",
         icon_path: str = None,
-        categories: str = "Utility"
+        categories: str = "Utility",
+        reuse_staging: bool = True,
+        compression: str = "xz",
+        compression_level: int = 6,
+        fast: bool = False
 ):
     """
     Creates a .deb package for the specified application.
@@ -251,10 +455,14 @@ def create_deb(
     :param output_dir: Directory to save the .deb package (default is current directory).
     :param icon_path: Path to an icon file for the application (optional).
     :param categories: Categories for the .desktop file (default is "Utility").
+    :param reuse_staging: Keep the staging tree in dist/linux for the next build and skip
+        re-copying an unchanged binary (default is True).
+    :param compression: Payload compression, "xz", "gzip" or "none" (default is "xz").
+    :param compression_level: Compression level passed to the compressor (default is 6).
+    :param fast: Skip payload compression entirely, for local test builds (default is False).
     """
 
-    from pathlib import Path
-    import shutil
+    from concurrent.futures import ThreadPoolExecutor
     # Define the directory structure
     root_dir = Path(cwd, 'dist', 'linux', app_name)
     debian_dir = root_dir / "DEBIAN"
@@ -262,64 +470,74 @@ def create_deb(
     desktop_dir = root_dir / "usr" / "share" / "applications"
     icon_dir = root_dir / "usr" / "share" / "icons" / "hicolor" / "512x512" / "apps"
 
-    # Create the necessary directories
-    debian_dir.mkdir(parents=True, exist_ok=True)
-    bin_dir.mkdir(parents=True, exist_ok=True)
-    desktop_dir.mkdir(parents=True, exist_ok=True)
-    if icon_path:
-        icon_dir.mkdir(parents=True, exist_ok=True)
-
-    # Copy the binary to the bin directory
+    # Check the inputs before staging anything
     binary_path = os.path.join(cwd, 'dist', app_name)
-    if not os.path.isfile(binary_path):
-        raise FileNotFoundError(f"Binary file '{binary_path}' not found.")
-    shutil.copy(binary_path, bin_dir / app_name)
+    binary_stat = _require_file(binary_path, "Binary file")
+    icon_stat = _require_file(icon_path, "Icon file") if icon_path else None
+
+    # The staged binary is reused while the source keeps the same size and mtime
+    stage_stamp = f"{binary_stat.st_size}:{binary_stat.st_mtime_ns}"
+    stamp_file = root_dir.parent / f"{app_name}.stage"
+    staged_binary = bin_dir / app_name
+    try:
+        binary_staged = reuse_staging and stamp_file.read_text() == stage_stamp and staged_binary.is_file()
+    except OSError:
+        binary_staged = False
 
     # Create the control file with dynamic content
-    control_content = f"""Package: {app_name}
-Version: {version}
-Section: base
-Priority: optional
-Architecture: {architecture}
-Depends: {dependencies}
-Maintainer: {maintainer}
-Description: {description}
-License: MIT
-"""
+    control_content = _DEB_CONTROL_TEMPLATE.format_map({
+        "app_name": app_name,
+        "version": version,
+        "architecture": architecture,
+        "dependencies": dependencies,
+        "maintainer": maintainer,
+        "description": description,
+    })
     control_file = debian_dir / "control"
-    control_file.write_text(control_content)
 
     # Create the .desktop file
-    desktop_content = f"""[Desktop Entry]
-Name={app_name}
-Comment={description}
-Exec=/usr/local/bin/{app_name}
-Icon=/usr/share/icons/hicolor/512x512/apps/{app_name}.png
-Terminal=false
-Type=Application
-Categories={categories};
-"""
+    desktop_content = _DESKTOP_TEMPLATE.format_map({
+        "app_name": app_name,
+        "description": description,
+        "categories": categories,
+    })
     desktop_file = desktop_dir / f"{app_name}.desktop"
-    desktop_file.write_text(desktop_content)
 
-    # Copy the icon file if provided
+    # Create only the leaf directories, in order, so each shared parent is made once
+    # instead of every concurrent mkdir racing to create root_dir/usr/...
+    # A reused tree already has all of them except, perhaps, the icon one
+    dirs = [] if binary_staged else [debian_dir, bin_dir, desktop_dir]
     if icon_path:
-        if not os.path.isfile(icon_path):
-            raise FileNotFoundError(f"Icon file '{icon_path}' not found.")
-        shutil.copy(icon_path, icon_dir / f"{app_name}.png")
-
-    # Set correct permissions for the DEBIAN directory and its contents
-    subprocess.run(["chmod", "-R", "755", str(debian_dir)], check=True)
-
-    # Build the .deb package using dpkg-deb
-    subprocess.run(["dpkg-deb", "--build", str(root_dir)], check=True)
-
-    # Move the generated .deb file to the desired output directory
-    output_deb_file = Path(output_dir) / f"{app_name}_{version}_{architecture}.deb"
-    shutil.move(root_dir.parent / f"{app_name}.deb", output_deb_file)
-
-    # Clean up the temporary build directory
-    shutil.rmtree(root_dir.parent)
+        dirs.append(icon_dir)
+    for leaf in dirs:
+        leaf.mkdir(parents=True, exist_ok=True)
+
+    # The staging steps are independent and IO-bound, so overlap them
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        tasks = [
+            executor.submit(write_text, control_file, control_content),
+            executor.submit(write_text, desktop_file, desktop_content),
+        ]
+        if not binary_staged:
+            tasks.append(executor.submit(fast_copy, binary_path, staged_binary, binary_stat))
+        if icon_path:
+            tasks.append(executor.submit(fast_copy, icon_path, icon_dir / f"{app_name}.png", icon_stat))
+        else:
+            # Drop an icon left over from a previous build of a reused tree
+            (icon_dir / f"{app_name}.png").unlink(missing_ok=True)
+        for task in tasks:
+            task.result()
+
+    # Build the .deb package straight into the output directory
+    output_deb_file = os.path.join(output_dir, f"{app_name}_{version}_{architecture}.deb")
+    os.makedirs(output_dir, exist_ok=True)
+    _build_deb(root_dir, output_deb_file, "none" if fast else compression, compression_level)
+
+    if reuse_staging:
+        write_text(stamp_file, stage_stamp)
+    else:
+        # Clean up the temporary build directory
+        shutil.rmtree(root_dir.parent, ignore_errors=True)
     print(f"Package created successfully: {output_deb_file}")
 
 
@@ -351,78 +569,89 @@ def create_rpm(
     :param categories: Categories for the .desktop file (default is "Utility").
     """
 
-    import shutil
-    from pathlib import Path
+    from concurrent.futures import ThreadPoolExecutor
     rpm_build_dir = Path(os.getenv('HOME')) / "rpmbuild"
     sources_dir = rpm_build_dir / "SOURCES"
     specs_dir = rpm_build_dir / "SPECS"
     rpm_dir = rpm_build_dir / "RPMS" / architecture
     desktop_file_name = f"{app_name}.desktop"
-    binary_path = Path(cwd, 'dist', app_name)
-
-    # Ensure RPM build directories exist
-    for dir_path in [sources_dir, specs_dir, rpm_dir]:
-        dir_path.mkdir(parents=True, exist_ok=True)
+    binary_path = os.path.join(cwd, 'dist', app_name)
 
-    # Copy the binary to SOURCES
-    if not os.path.isfile(binary_path):
-        raise FileNotFoundError(f"Binary file '{binary_path}' not found.")
-    shutil.copy(binary_path, sources_dir / app_name)
+    # Check the inputs before staging anything
+    input_stats = {binary_path: _require_file(binary_path, "Binary file")}
+    if icon_path:
+        input_stats[icon_path] = _require_file(icon_path, "Icon file")
 
     # Create the .desktop file for system's application menu
-    desktop_content = f"""[Desktop Entry]
-Name={app_name}
-Comment={description}
-Exec=/usr/local/bin/{app_name}
-Icon=/usr/share/icons/hicolor/512x512/apps/{app_name}.png
-Terminal=false
-Type=Application
-Categories={categories};
-"""
+    desktop_content = _DESKTOP_TEMPLATE.format_map({
+        "app_name": app_name,
+        "description": description,
+        "categories": categories,
+    })
     desktop_file = sources_dir / desktop_file_name
-    desktop_file.write_text(desktop_content)
-
-    # Copy the icon file if provided
-    if icon_path:
-        if not os.path.isfile(icon_path):
-            raise FileNotFoundError(f"Icon file '{icon_path}' not found.")
-        icon_target_dir = sources_dir / "icons" / "hicolor" / "512x512" / "apps"
-        icon_target_dir.mkdir(parents=True, exist_ok=True)
-        shutil.copy(icon_path, icon_target_dir / f"{app_name}.png")
+    icon_target_dir = sources_dir / "icons" / "hicolor" / "512x512" / "apps"
 
     # Create the spec file
-    spec_content = f"""
-Name:           {app_name}
-Version:        {version}
-Release:        {release}
-Summary:        {description}
-License:        GPL
-Group:          Applications/System
-Architecture:   {architecture}
-Requires:       {dependencies}
-
-%description
-{description}
-
-%files
-%attr(0755,root,root) /usr/local/bin/{app_name}
-%attr(0644,root,root) /usr/share/applications/{desktop_file_name}
-%attr(0644,root,root) /usr/share/icons/hicolor/512x512/apps/{app_name}.png
-
-%post
-update-desktop-database &> /dev/null || :
-
-%postun
-update-desktop-database &> /dev/null || :
-"""
+    spec_content = _RPM_SPEC_TEMPLATE.format_map({
+        "app_name": app_name,
+        "version": version,
+        "release": release,
+        "description": description,
+        "architecture": architecture,
+        "dependencies": dependencies,
+        "desktop_file_name": desktop_file_name,
+    })
+
+    # Skip rpmbuild entirely when none of its inputs changed since the last build
+    rpm_name = f"{app_name}-{version}-{release}.{architecture}.rpm"
+    output_rpm_file = Path(output_dir) / rpm_name
+    stamp_file = Path(output_dir) / f"{rpm_name}.sha256"
+    inputs = hashlib.sha256()
+    for path, st in input_stats.items():
+        inputs.update(f"{path}:{st.st_size}:{st.st_mtime_ns}\0".encode())
+    inputs.update(desktop_content.encode())
+    inputs.update(spec_content.encode())
+    digest = inputs.hexdigest()
+    try:
+        unchanged = stamp_file.read_text() == digest and output_rpm_file.is_file()
+    except OSError:
+        unchanged = False
+    if unchanged:
+        print(f"Package is up to date: {output_dir}/{rpm_name}")
+        return
+
+    # Ensure RPM build directories exist, then stage the sources concurrently
+    dirs = [] if (rpm_build_dir, architecture) in _RPM_DIRS_READY else [sources_dir, specs_dir, rpm_dir]
+    if icon_path:
+        dirs.append(icon_target_dir)
+    for leaf in dirs:
+        leaf.mkdir(parents=True, exist_ok=True)
+    _RPM_DIRS_READY.add((rpm_build_dir, architecture))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        tasks = [
+            executor.submit(fast_copy, binary_path, sources_dir / app_name, input_stats[binary_path]),
+            executor.submit(write_text, desktop_file, desktop_content),
+        ]
+        if icon_path:
+            tasks.append(
+                executor.submit(fast_copy, icon_path, icon_target_dir / f"{app_name}.png", input_stats[icon_path])
+            )
+        for task in tasks:
+            task.result()
 
     spec_file = specs_dir / f"{app_name}.spec"
-    spec_file.write_text(spec_content)
+    write_text(spec_file, spec_content)
 
-    # Build the RPM package
-    subprocess.run(["rpmbuild", "-ba", str(spec_file)], check=True)
+    # Build the binary RPM only; nothing consumes the source RPM. The payload is
+    # compressed with multithreaded xz (rpm >= 4.14)
+    subprocess.run(
+        ["rpmbuild", "-bb", "--define", "_binary_payload w6T0.xzdio", str(spec_file)],
+        check=True
+    )
     # Move the generated RPM package to the output directory
-    rpm_package_file = rpm_dir / f"{app_name}-{version}-{release}.{architecture}.rpm"
-    shutil.move(rpm_package_file, Path(output_dir) / rpm_package_file.name)
+    rpm_package_file = rpm_dir / rpm_name
+    os.makedirs(output_dir, exist_ok=True)
+    move_file(rpm_package_file, output_rpm_file)
+    write_text(stamp_file, digest)
 
     print(f"Package created successfully: {output_dir}/{rpm_package_file.name}")
@@ -18,13 +18,24 @@ async def greet(window: PyWuiWindow):
     return "Hello World!"
 
 
+TIME_FORMAT = "%d-%02d-%02d %02d:%02d:%02d"
+
+# Keep a reference to background tasks so they are not garbage collected
+background_tasks = set()
+
+
 async def on_start(window: PyWuiWindow):
     async def send_time():
+        emit = window.emit
         while True:
-            window.emit("time", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            await asyncio.sleep(1)
-
-    await asyncio.create_task(send_time())
+            now = datetime.now()
+            emit("time", TIME_FORMAT % (now.year, now.month, now.day, now.hour, now.minute, now.second))
+            # Wake just after the next second boundary instead of drifting by the emit time
+            await asyncio.sleep(1.001 - now.microsecond / 1_000_000)
+
+    task = asyncio.create_task(send_time())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
 
 
 app = PyWuiApp()
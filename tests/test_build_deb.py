@@ -0,0 +1,85 @@
+import io
+import shutil
+import tarfile
+
+import pytest
+
+from pywui_cli import installer
+
+AR_MAGIC = b"!<arch>\n"
+AR_HEADER_SIZE = 60
+
+
+def _read_ar(path):
+    """Return the (name, data) members of an ar archive, checking each 60-byte header."""
+    with open(path, "rb") as f:
+        content = f.read()
+    assert content[:len(AR_MAGIC)] == AR_MAGIC
+    members = []
+    offset = len(AR_MAGIC)
+    while offset < len(content):
+        header = content[offset:offset + AR_HEADER_SIZE]
+        assert len(header) == AR_HEADER_SIZE
+        assert header[58:60] == b"`\n"
+        name = header[:16].decode("ascii").rstrip()
+        size = int(header[48:58].decode("ascii"))
+        offset += AR_HEADER_SIZE
+        members.append((name, content[offset:offset + size]))
+        # Members are padded to an even offset
+        offset += size + size % 2
+    assert offset == len(content)
+    return members
+
+
+def _entries(data: bytes):
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as tar:
+        return {info.name: info for info in tar.getmembers()}
+
+
+@pytest.fixture
+def staging_tree(tmp_path):
+    root_dir = tmp_path / "build" / "root"
+    (root_dir / "DEBIAN").mkdir(parents=True)
+    (root_dir / "DEBIAN" / "control").write_text("Package: demo\nVersion: 1.0.0\n")
+    bin_dir = root_dir / "usr" / "local" / "bin"
+    bin_dir.mkdir(parents=True)
+    (bin_dir / "demo").write_bytes(b"\x7fELF" + b"\0" * 1001)
+    (bin_dir / "demo").chmod(0o755)
+    desktop_dir = root_dir / "usr" / "share" / "applications"
+    desktop_dir.mkdir(parents=True)
+    (desktop_dir / "demo.desktop").write_text("[Desktop Entry]\nName=demo\n")
+    return root_dir
+
+
+@pytest.mark.parametrize("external", [True, False], ids=["external", "tarfile"])
+@pytest.mark.parametrize("compression, suffix", [("xz", ".xz"), ("gzip", ".gz"), ("none", "")])
+def test_build_deb(staging_tree, tmp_path, monkeypatch, compression, suffix, external):
+    if external:
+        tools = installer._DEB_COMPRESSION[compression][3]
+        if tools and not any(shutil.which(tool) for tool, _ in tools):
+            pytest.skip(f"no external {compression} compressor installed")
+    else:
+        monkeypatch.setattr(installer.shutil, "which", lambda name: None)
+    output_file = tmp_path / "demo.deb"
+
+    installer._build_deb(staging_tree, str(output_file), compression, 1)
+
+    members = _read_ar(output_file)
+    assert [name for name, _ in members] == ["debian-binary", "control.tar.gz", f"data.tar{suffix}"]
+    assert members[0][1] == b"2.0\n"
+
+    control = _entries(members[1][1])
+    assert "./control" in control
+    for info in control.values():
+        assert (info.uid, info.gid, info.uname, info.gname) == (0, 0, "root", "root")
+        assert info.mode == 0o755
+
+    data = _entries(members[2][1])
+    assert "./usr/local/bin/demo" in data
+    assert "./usr/share/applications/demo.desktop" in data
+    assert not any(name == "./DEBIAN" or name.startswith("./DEBIAN/") for name in data)
+    for info in data.values():
+        assert (info.uid, info.gid, info.uname, info.gname) == (0, 0, "root", "root")
+    assert data["./usr/local/bin/demo"].mode & 0o777 == 0o755
+    with tarfile.open(fileobj=io.BytesIO(members[2][1]), mode="r:*") as tar:
+        assert tar.extractfile("./usr/local/bin/demo").read() == b"\x7fELF" + b"\0" * 1001
@@ -0,0 +1,161 @@
+import errno
+import os
+import stat
+
+import pytest
+
+from pywui_cli import fsutil
+
+SIZE = 3 * (1 << 20) + 123
+
+
+@pytest.fixture
+def src(tmp_path):
+    path = tmp_path / "src.bin"
+    path.write_bytes(os.urandom(SIZE))
+    path.chmod(0o751)
+    return path
+
+
+@pytest.fixture
+def dst(tmp_path):
+    # A larger existing destination must be truncated, not partially overwritten
+    path = tmp_path / "dst.bin"
+    path.write_bytes(b"x" * (SIZE * 2))
+    path.chmod(0o600)
+    return path
+
+
+def _raise(errnum):
+    def fail(*args):
+        raise OSError(errnum, os.strerror(errnum))
+    return fail
+
+
+def _capped(real, size_index, limit):
+    """Wrap a copy syscall so it copies at most ``limit`` bytes per call."""
+    def copy(*args):
+        args = list(args)
+        args[size_index] = min(args[size_index], limit)
+        return real(*args)
+    return copy
+
+
+def _stop_after(real, size_index, total):
+    """Wrap a copy syscall so it reports EOF once ``total`` bytes have been copied."""
+    copied = 0
+
+    def copy(*args):
+        nonlocal copied
+        args = list(args)
+        args[size_index] = min(args[size_index], total - copied)
+        if not args[size_index]:
+            return 0
+        n = real(*args)
+        copied += n
+        return n
+    return copy
+
+
+def _assert_copied(src, dst):
+    assert dst.read_bytes() == src.read_bytes()
+    assert stat.S_IMODE(dst.stat().st_mode) == 0o751
+
+
+def test_copy(src, dst):
+    assert fsutil.fast_copy(src, dst) == dst
+    _assert_copied(src, dst)
+
+
+def test_copy_with_src_stat(src, dst):
+    fsutil.fast_copy(src, dst, os.stat(src))
+    _assert_copied(src, dst)
+
+
+def test_not_linux(src, dst, monkeypatch):
+    monkeypatch.setattr(fsutil, "_USE_KERNEL_COPY", False)
+    # On macOS sendfile only writes to sockets; the kernel copy path must not be reached at all
+    def unexpected(*args):
+        pytest.fail("kernel copy used outside Linux")
+
+    monkeypatch.setattr(fsutil, "_kernel_copy", unexpected)
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+@pytest.mark.parametrize("errnum", [errno.EXDEV, errno.ENOSYS, errno.ENOTSOCK, errno.EINVAL, errno.EOPNOTSUPP])
+def test_copy_file_range_unsupported(src, dst, monkeypatch, errnum):
+    monkeypatch.setattr(os, "copy_file_range", _raise(errnum), raising=False)
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+@pytest.mark.parametrize("errnum", [errno.EXDEV, errno.ENOSYS, errno.ENOTSOCK, errno.EINVAL, errno.EOPNOTSUPP])
+def test_no_kernel_copy(src, dst, monkeypatch, errnum):
+    monkeypatch.setattr(os, "copy_file_range", _raise(errnum), raising=False)
+    monkeypatch.setattr(os, "sendfile", _raise(errnum), raising=False)
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+def test_missing_syscalls(src, dst, monkeypatch):
+    monkeypatch.delattr(os, "copy_file_range", raising=False)
+    monkeypatch.delattr(os, "sendfile", raising=False)
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+def test_real_error_propagates(src, dst, monkeypatch):
+    monkeypatch.setattr(os, "copy_file_range", _raise(errno.EIO), raising=False)
+    with pytest.raises(OSError) as exc_info:
+        fsutil.fast_copy(src, dst)
+    assert exc_info.value.errno == errno.EIO
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range"), reason="needs copy_file_range")
+def test_copy_file_range_short_counts(src, dst, monkeypatch):
+    monkeypatch.setattr(os, "copy_file_range", _capped(os.copy_file_range, 2, 4096))
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range") or not hasattr(os, "sendfile"), reason="needs Linux syscalls")
+def test_sendfile_finishes_early_copy_file_range_eof(src, dst, monkeypatch):
+    # copy_file_range returning 0 before the end hands the rest to sendfile at the same offset
+    monkeypatch.setattr(os, "copy_file_range", _stop_after(os.copy_file_range, 2, 54321))
+    monkeypatch.setattr(os, "sendfile", _capped(os.sendfile, 3, 65536))
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+@pytest.mark.skipif(not hasattr(os, "copy_file_range") or not hasattr(os, "sendfile"), reason="needs Linux syscalls")
+def test_sendfile_resumes_after_copy_file_range(src, dst, monkeypatch):
+    copy_file_range = os.copy_file_range
+    calls = []
+
+    def partial_then_fail(infd, outfd, count, offset_src, offset_dst):
+        if calls:
+            raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+        calls.append(offset_src)
+        return copy_file_range(infd, outfd, min(count, 1 << 20), offset_src, offset_dst)
+
+    monkeypatch.setattr(os, "copy_file_range", partial_then_fail)
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+@pytest.mark.skipif(not hasattr(os, "sendfile"), reason="needs sendfile")
+def test_buffered_remainder(src, dst, monkeypatch):
+    # The kernel copies stop early without an error; the rest goes through the buffered loop
+    monkeypatch.setattr(os, "copy_file_range", _raise(errno.ENOSYS), raising=False)
+    monkeypatch.setattr(os, "sendfile", _stop_after(os.sendfile, 3, 12345))
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
+
+
+def test_empty_file(tmp_path, dst):
+    src = tmp_path / "empty"
+    src.write_bytes(b"")
+    src.chmod(0o751)
+    fsutil.fast_copy(src, dst)
+    _assert_copied(src, dst)
@@ -0,0 +1,28 @@
+import pytest
+
+from pywui_cli.builder import _split_build_args
+
+
+@pytest.mark.parametrize("args, spec_args, build_args", [
+    ([], [], []),
+    (["--distpath", "out"], [], ["--distpath", "out"]),
+    (["--distpath=out"], [], ["--distpath=out"]),
+    (["--workpath"], [], ["--workpath"]),
+    (["--hidden-import", "x", "--workpath"], ["--hidden-import", "x"], ["--workpath"]),
+    (["--upx-dir", "/opt/upx"], [], ["--upx-dir", "/opt/upx"]),
+    (["-y"], [], ["-y"]),
+    (["--noconfirm", "--clean"], [], ["--noconfirm", "--clean"]),
+    (["--hidden-import", "x", "--noupx"], ["--hidden-import", "x", "--noupx"], []),
+    (["--hidden-import=x"], ["--hidden-import=x"], []),
+    (
+        ["--clean", "--hidden-import", "x", "--distpath", "out", "--noupx", "--workpath=build", "-y"],
+        ["--hidden-import", "x", "--noupx"],
+        ["--clean", "--distpath", "out", "--workpath=build", "-y"],
+    ),
+])
+def test_split_build_args(args, spec_args, build_args):
+    assert _split_build_args(args) == (spec_args, build_args)
+
+
+def test_split_build_args_accepts_tuple():
+    assert _split_build_args(("--clean", "--noupx")) == (["--noupx"], ["--clean"])